@@ -1,12 +1,9 @@
 import argparse
 import os
 import sys
+from typing import List, Optional
 
 from .config import load_config, limits_for_level
-from .fetcher import discover_llms_url, fetch_text, fetch_documents
-from .parser import parse_llms_text
-from .generator import generate_skill
-from .installer import install_skill
 from .models import GeneratorOptions
 
 
@@ -14,7 +11,7 @@ def _is_url(source: str) -> bool:
     return source.startswith("http://") or source.startswith("https://")
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     parser = argparse.ArgumentParser(description="Generate Agent Skills from llms.txt")
     parser.add_argument("source", help="llms.txt URL, base docs URL, or local file path")
     parser.add_argument("--out", default=".", help="Output directory for generated skill")
@@ -24,7 +21,12 @@ def main() -> None:
     parser.add_argument("--allow-external", action="store_true", help="Allow external domains")
     parser.add_argument("--heuristic-level", choices=["compact", "balanced", "verbose"], help="Skill description detail level")
     parser.add_argument("--claude", action="store_true", help="Install to ~/.claude/skills instead of ~/.agents/skills")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    # Heavy modules (requests, trafilatura) load only once arguments are valid.
+    from .parser import parse_llms_text
+    from .generator import generate_skill
+    from .installer import install_skill
 
     cfg = load_config(None)
     include_optional = args.include_optional or cfg.get("include_optional", False)
@@ -36,8 +38,9 @@ def main() -> None:
 
     source_url = None
     if _is_url(args.source):
-        llms_url = discover_llms_url(args.source, user_agent)
-        text = fetch_text(llms_url, user_agent)
+        from .fetcher import discover_and_fetch
+
+        llms_url, text = discover_and_fetch(args.source, user_agent)
         source_url = llms_url
     else:
         if not os.path.exists(args.source):
@@ -67,8 +70,10 @@ def main() -> None:
 
     fetch_result = None
     if snapshot:
+        from .fetcher import fetch_documents
+
         fetch_result = fetch_documents(
-            links=[l for s in parsed.sections for l in s.links],
+            links=parsed.links,
             base_url=source_url,
             include_optional=include_optional,
             allow_external=allow_external,
@@ -77,6 +82,7 @@ def main() -> None:
             max_bytes_per_doc=options.max_bytes_per_doc,
             max_total_bytes=options.max_total_bytes,
             user_agent=user_agent,
+            deadline=cfg.get("fetch_deadline"),
         )
 
     output_path = generate_skill(parsed, options, fetch_result)
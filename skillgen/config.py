@@ -1,7 +1,11 @@
+import hashlib
+import json
 import os
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping
 
-import yaml
+from .util import cache_dir, write_json
 
 
 _LEVEL_LIMITS = {
@@ -26,8 +30,13 @@ _LEVEL_LIMITS = {
 }
 
 
-def limits_for_level(level: str) -> Dict[str, int]:
-    return _LEVEL_LIMITS.get((level or "balanced").strip().lower(), _LEVEL_LIMITS["balanced"]).copy()
+@lru_cache(maxsize=8)
+def _limits(level: str) -> Mapping[str, int]:
+    return MappingProxyType(_LEVEL_LIMITS.get(level, _LEVEL_LIMITS["balanced"]))
+
+
+def limits_for_level(level: str) -> Mapping[str, int]:
+    return _limits((level or "balanced").strip().lower())
 
 
 def default_config() -> Dict[str, Any]:
@@ -38,9 +47,36 @@ def default_config() -> Dict[str, Any]:
         "allow_external": False,
         "heuristic_level": "balanced",
         "user_agent": "SkillGen/0.1",
+        "fetch_deadline": None,
     }
 
 
+def _config_cache_path(path: str) -> str:
+    st = os.stat(path)
+    raw_key = f"{os.path.abspath(path)}:{st.st_mtime_ns}:{st.st_size}"
+    key = hashlib.blake2b(raw_key.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir(), f"config-{key}.json")
+
+
+def _read_yaml(path: str) -> Any:
+    import yaml
+
+    # CSafeLoader only exists when PyYAML was built against libyaml.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, "rb") as f:
+        return yaml.load(f.read(), Loader=loader) or {}
+
+
+def _write_config_cache(cache_path: str, data: Any) -> None:
+    try:
+        # Only cache documents that survive a JSON round trip unchanged.
+        if json.loads(json.dumps(data)) != data:
+            return
+        write_json(cache_path, data)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
 def load_config(path: Optional[str]) -> Dict[str, Any]:
     if not path:
         path = "skillgen.yaml"
@@ -48,8 +84,18 @@ def load_config(path: Optional[str]) -> Dict[str, Any]:
             return default_config()
     if not os.path.exists(path):
         return default_config()
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    cache_path = None
+    data = None
+    try:
+        cache_path = _config_cache_path(path)
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = None
+    if data is None:
+        data = _read_yaml(path)
+        if cache_path:
+            _write_config_cache(cache_path, data)
     cfg = default_config()
     cfg.update(data)
     return cfg
@@ -1,9 +1,10 @@
 from typing import Optional
 
-import trafilatura
-
 
 def html_to_markdown(html: str, url: Optional[str] = None) -> str:
+    # trafilatura is slow to import; only HTML pages need it.
+    import trafilatura
+
     md = trafilatura.extract(
         html,
         output_format="markdown",
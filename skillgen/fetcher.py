@@ -1,21 +1,31 @@
-from typing import List, Optional, Tuple, Dict
-from urllib.parse import urljoin, urlparse, urlunparse
+import atexit
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Set, Tuple, Dict
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .models import DocLink, FetchResult, FetchedDoc
+from .httpcache import DiskCache
+from .util import is_same_host, normalize_url
 
 
-def normalize_url(url: str, base_url: Optional[str] = None) -> str:
-    if base_url:
-        url = urljoin(base_url, url)
-    parsed = urlparse(url)
-    parsed = parsed._replace(fragment="")
-    return urlunparse(parsed)
+@lru_cache(maxsize=1)
+def _shared_session() -> requests.Session:
+    # One keep-alive pool per process: discovery, llms.txt and document
+    # fetches to the same host reuse connections instead of new TLS handshakes.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    atexit.register(session.close)
+    return session
 
 
-def is_same_host(url: str, base_url: str) -> bool:
-    return urlparse(url).netloc.lower() == urlparse(base_url).netloc.lower()
+_http_cache = DiskCache()
 
 
 def markdown_candidates(url: str) -> List[str]:
@@ -53,23 +63,37 @@ def _fetch_stream(
     url: str,
     max_bytes: int,
     user_agent: str,
-) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str], int, Optional[str], int, bool]:
+    extra_headers: Optional[Dict[str, str]] = None,
+    stop_at: Optional[float] = None,
+) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str], int, Optional[str], int, bool, Optional[str]]:
     headers = {"User-Agent": user_agent}
+    if extra_headers:
+        headers.update(extra_headers)
+    timeout: float = 20
+    if stop_at is not None:
+        # Socket waits never run past the caller's deadline.
+        timeout = min(timeout, stop_at - time.monotonic())
+        if timeout <= 0:
+            return None, None, None, None, 0, "fetch deadline reached", 0, False, None
     try:
-        r = session.get(url, headers=headers, timeout=20, stream=True, allow_redirects=True)
+        r = session.get(url, headers=headers, timeout=timeout, stream=True, allow_redirects=True)
     except Exception as exc:
-        return None, None, None, None, 0, f"request failed: {exc}", 0, False
+        return None, None, None, None, 0, f"request failed: {exc}", 0, False, None
     if len(r.history) > 5:
-        return None, None, None, None, r.status_code, "too many redirects", 0, False
+        return None, None, None, None, r.status_code, "too many redirects", 0, False, None
     content_type = r.headers.get("Content-Type")
     etag = r.headers.get("ETag")
     last_modified = r.headers.get("Last-Modified")
+    cache_control = r.headers.get("Cache-Control")
     if r.status_code >= 400:
-        return None, content_type, None, last_modified, r.status_code, f"http {r.status_code}", 0, False
+        return None, content_type, None, last_modified, r.status_code, f"http {r.status_code}", 0, False, None
     chunks = []
     total = 0
     truncated = False
     for chunk in r.iter_content(chunk_size=65536):
+        if stop_at is not None and time.monotonic() >= stop_at:
+            r.close()
+            return None, content_type, None, last_modified, r.status_code, "fetch deadline reached", 0, False, None
         if not chunk:
             continue
         total += len(chunk)
@@ -87,11 +111,83 @@ def _fetch_stream(
         text = data.decode("utf-8", errors="ignore")
     if truncated:
         text += "\n\n[TRUNCATED]\n"
-    return text, content_type, etag, last_modified, r.status_code, None, len(data), truncated
+    return text, content_type, etag, last_modified, r.status_code, None, len(data), truncated, cache_control
+
+
+def _cached_doc(normalized: str, entry: Dict[str, Any]) -> FetchedDoc:
+    return FetchedDoc(
+        source_url=normalized,
+        final_url=entry["url"],
+        content_type=entry.get("content_type"),
+        status_code=200,
+        ok=True,
+        error=None,
+        bytes=entry["bytes"],
+        text=entry["text"],
+        etag=entry.get("etag"),
+        last_modified=entry.get("last_modified"),
+    )
+
+
+def _fetch_link(
+    session: requests.Session,
+    normalized: str,
+    request_cap: int,
+    user_agent: str,
+    stop_at: Optional[float] = None,
+) -> FetchedDoc:
+    candidates = markdown_candidates(normalized)
+    # Only bodies that fit this fetch's byte cap can stand in for a download.
+    cached: Dict[str, Dict[str, Any]] = {}
+    for candidate in candidates:
+        entry = _http_cache.get(candidate)
+        if entry and entry["bytes"] <= request_cap:
+            if _http_cache.is_fresh(entry):
+                return _cached_doc(normalized, entry)
+            cached[candidate] = entry
+
+    for candidate in candidates:
+        entry = cached.get(candidate)
+        text, content_type, etag, last_modified, status, err, fetched_bytes, truncated, cache_control = _fetch_stream(
+            session,
+            candidate,
+            request_cap,
+            user_agent,
+            extra_headers=_http_cache.conditional_headers(entry),
+            stop_at=stop_at,
+        )
+        if entry and status == 304:
+            return _cached_doc(normalized, _http_cache.refresh(entry))
+        if err:
+            continue
+        if not truncated:
+            _http_cache.put(candidate, text, content_type, etag, last_modified, fetched_bytes, cache_control)
+        return FetchedDoc(
+            source_url=normalized,
+            final_url=candidate,
+            content_type=content_type,
+            status_code=status,
+            ok=True,
+            error=None,
+            bytes=fetched_bytes,
+            text=text,
+            etag=etag,
+            last_modified=last_modified,
+        )
+    return FetchedDoc(
+        source_url=normalized,
+        final_url=normalized,
+        content_type=None,
+        status_code=0,
+        ok=False,
+        error="fetch failed",
+        bytes=0,
+        text=None,
+    )
 
 
 def fetch_documents(
-    links: List[DocLink],
+    links: Iterable[DocLink],
     base_url: Optional[str],
     include_optional: bool,
     allow_external: bool,
@@ -100,118 +196,156 @@ def fetch_documents(
     max_bytes_per_doc: int,
     max_total_bytes: int,
     user_agent: str,
+    max_workers: int = 8,
+    deadline: Optional[float] = None,
+    session: Optional[requests.Session] = None,
 ) -> FetchResult:
-    session = requests.Session()
-    docs: Dict[str, FetchedDoc] = {}
+    session = session or _shared_session()
+    results: Dict[str, FetchedDoc] = {}
+    submitted: Dict[str, None] = {}
+    seen: Set[str] = set()
     warnings: List[str] = []
 
-    total_bytes = 0
+    # Each in-flight fetch reserves its byte cap up front and refunds whatever
+    # it did not use, so concurrent fetches can never exceed max_total_bytes.
+    # Once the unreserved budget drops below a full page, pending fetches are
+    # settled first so refunds size the next cap exactly as a serial run would.
+    reserved_bytes = 0
     count = 0
+    pending: Dict[Future, Tuple[str, int]] = {}
 
-    for link in links:
-        if link.optional and not include_optional:
-            continue
-        if count >= max_pages:
-            warnings.append("max_pages limit reached")
-            break
-        if total_bytes >= max_total_bytes:
-            warnings.append("max_total_bytes limit reached")
-            break
-        normalized = normalize_url(link.url, base_url)
-        parsed = urlparse(normalized)
-        scheme = parsed.scheme.lower()
-        host = parsed.netloc.lower()
+    stop_at = time.monotonic() + deadline if deadline is not None else None
 
-        if scheme and scheme != "https":
-            warnings.append(f"non-https link skipped: {normalized}")
-            continue
+    def remaining() -> Optional[float]:
+        return None if stop_at is None else max(0.0, stop_at - time.monotonic())
 
-        if not allow_external:
-            if domain_allowlist:
-                allowed = {d.lower() for d in domain_allowlist}
-                if not host or host not in allowed:
-                    warnings.append(f"external link skipped: {normalized}")
-                    continue
-            elif base_url:
-                if not is_same_host(normalized, base_url):
-                    warnings.append(f"external link skipped: {normalized}")
-                    continue
-            else:
-                if host:
-                    warnings.append(f"external link skipped: {normalized}")
-                    continue
-                warnings.append(f"relative link skipped (no base_url): {normalized}")
-                continue
+    def settle(done) -> None:
+        nonlocal reserved_bytes
+        for future in done:
+            normalized, request_cap = pending.pop(future)
+            doc = future.result()
+            reserved_bytes -= request_cap - doc.bytes
+            results[normalized] = doc
 
-        if normalized in docs:
-            continue
-
-        final_doc = None
-        for candidate in markdown_candidates(normalized):
-            remaining_bytes = max_total_bytes - total_bytes
-            if remaining_bytes <= 0:
+    timed_out = False
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for link in links:
+            if link.optional and not include_optional:
+                continue
+            if count >= max_pages:
+                warnings.append("max_pages limit reached")
+                break
+            while pending and max_total_bytes - reserved_bytes < max_bytes_per_doc and remaining() != 0:
+                done, _ = wait(pending, timeout=remaining(), return_when=FIRST_COMPLETED)
+                settle(done)
+            if remaining() == 0:
+                timed_out = True
+                break
+            if reserved_bytes >= max_total_bytes:
                 warnings.append("max_total_bytes limit reached")
                 break
-            request_cap = min(max_bytes_per_doc, remaining_bytes)
-            text, content_type, etag, last_modified, status, err, fetched_bytes, _ = _fetch_stream(
-                session,
-                candidate,
-                request_cap,
-                user_agent,
-            )
-            if err:
+            normalized = normalize_url(link.url, base_url)
+            # Sections often cross-list the same page; only the first link is
+            # fetched or reported.
+            if normalized in seen:
                 continue
-            total_bytes += fetched_bytes
-            final_doc = FetchedDoc(
-                source_url=normalized,
-                final_url=candidate,
-                content_type=content_type,
-                status_code=status,
-                ok=True,
-                error=None,
-                bytes=fetched_bytes,
-                text=text,
-                etag=etag,
-                last_modified=last_modified,
-            )
-            break
+            seen.add(normalized)
+            parsed = urlparse(normalized)
+            scheme = parsed.scheme.lower()
+            host = parsed.netloc.lower()
+
+            if scheme and scheme != "https":
+                warnings.append(f"non-https link skipped: {normalized}")
+                continue
+
+            if not allow_external:
+                if domain_allowlist:
+                    allowed = {d.lower() for d in domain_allowlist}
+                    if not host or host not in allowed:
+                        warnings.append(f"external link skipped: {normalized}")
+                        continue
+                elif base_url:
+                    if not is_same_host(normalized, base_url):
+                        warnings.append(f"external link skipped: {normalized}")
+                        continue
+                else:
+                    if host:
+                        warnings.append(f"external link skipped: {normalized}")
+                        continue
+                    warnings.append(f"relative link skipped (no base_url): {normalized}")
+                    continue
 
-        if final_doc is None:
-            final_doc = FetchedDoc(
-                source_url=normalized,
-                final_url=normalized,
-                content_type=None,
-                status_code=0,
-                ok=False,
-                error="fetch failed",
-                bytes=0,
-                text=None,
-            )
-        docs[normalized] = final_doc
-        count += 1
+            request_cap = min(max_bytes_per_doc, max_total_bytes - reserved_bytes)
+            reserved_bytes += request_cap
+            future = pool.submit(_fetch_link, session, normalized, request_cap, user_agent, stop_at)
+            pending[future] = (normalized, request_cap)
+            submitted[normalized] = None
+            count += 1
 
+        settle(wait(pending, timeout=remaining()).done)
+    finally:
+        # Stragglers are not waited for here. Their socket timeouts are capped
+        # at the deadline and they stop reading once it passes, so worker
+        # threads (which the interpreter joins at exit) wind down on their own.
+        pool.shutdown(wait=not pending, cancel_futures=True)
+    # One pass per crawl keeps the cache bounded off the per-page path.
+    _http_cache.prune()
+
+    if timed_out or pending:
+        warnings.append("fetch deadline reached")
+    for normalized, _ in pending.values():
+        warnings.append(f"fetch abandoned: {normalized}")
+    docs = {normalized: results[normalized] for normalized in submitted if normalized in results}
     return FetchResult(docs=docs, warnings=warnings)
 
 
-def fetch_text(url: str, user_agent: str) -> str:
-    session = requests.Session()
-    text, _, _, _, status, err, _, _ = _fetch_stream(session, url, 5_000_000, user_agent)
+def fetch_text(url: str, user_agent: str, session: Optional[requests.Session] = None) -> str:
+    cached = _http_cache.get(url)
+    if cached and _http_cache.is_fresh(cached):
+        return cached["text"]
+    text, content_type, etag, last_modified, status, err, fetched_bytes, truncated, cache_control = _fetch_stream(
+        session or _shared_session(),
+        url,
+        5_000_000,
+        user_agent,
+        extra_headers=_http_cache.conditional_headers(cached),
+    )
+    if cached and status == 304:
+        return _http_cache.refresh(cached)["text"]
     if err or status >= 400 or text is None:
         raise RuntimeError(f"failed to fetch {url}: {err or status}")
+    if not truncated:
+        _http_cache.put(url, text, content_type, etag, last_modified, fetched_bytes, cache_control)
     return text
 
 
-def discover_llms_url(base_url: str, user_agent: str, allow_well_known: bool = True) -> str:
+def discover_and_fetch(
+    base_url: str,
+    user_agent: str,
+    allow_well_known: bool = True,
+    session: Optional[requests.Session] = None,
+) -> Tuple[str, str]:
     if base_url.endswith("llms.txt"):
-        return base_url
+        return base_url, fetch_text(base_url, user_agent, session=session)
     candidates = [base_url.rstrip("/") + "/llms.txt"]
     if allow_well_known:
         candidates.append(base_url.rstrip("/") + "/.well-known/llms.txt")
     last_err = None
     for c in candidates:
         try:
-            _ = fetch_text(c, user_agent)
-            return c
+            return c, fetch_text(c, user_agent, session=session)
         except Exception as e:
             last_err = e
     raise RuntimeError(f"no llms.txt found at {base_url}: {last_err}")
+
+
+def discover_llms_url(
+    base_url: str,
+    user_agent: str,
+    allow_well_known: bool = True,
+    session: Optional[requests.Session] = None,
+) -> str:
+    if base_url.endswith("llms.txt"):
+        return base_url
+    return discover_and_fetch(base_url, user_agent, allow_well_known, session=session)[0]
@@ -4,11 +4,10 @@ from typing import List, Dict
 from urllib.parse import urlparse
 
 from .models import ParsedLlms, FetchResult, GeneratorOptions
-from .util import ensure_dir, write_text, write_json, slugify, safe_filename, sha256_text
+from .util import ensure_dir, normalize_url, write_text, write_json, slugify, safe_filename, sha256_text
 from .converter import convert_to_markdown
 from .indexer import render_index, render_section_index
 from .keywords import generate_keywords
-from .fetcher import normalize_url
 
 
 def _extract_headings(md: str) -> List[str]:
@@ -141,22 +140,17 @@ def generate_skill(
 
     write_text(os.path.join(references_dir, "_input", "llms.txt"), parsed.raw_text)
 
-    all_links = []
+    all_links = [link for link in parsed.links if not (link.optional and not options.include_optional)]
+    section_titles: List[str] = []
+    section_map: Dict[str, List[dict]] = {}
     for section in parsed.sections:
-        for link in section.links:
-            if link.optional and not options.include_optional:
-                continue
-            all_links.append(link)
+        if not (section.optional and not options.include_optional):
+            section_titles.append(section.title)
+            section_map.setdefault(section.title, [])
 
     catalog = []
-    section_map: Dict[str, List[dict]] = {}
     headings_pool: List[str] = []
 
-    for section in parsed.sections:
-        if section.optional and not options.include_optional:
-            continue
-        section_map.setdefault(section.title, [])
-
     if options.snapshot and fetch_result:
         for link in all_links:
             section_title = link.section_title or "General"
@@ -222,7 +216,6 @@ def generate_skill(
             catalog.append(entry)
             section_map.setdefault(section_title, []).append(entry)
 
-    section_titles = [s.title for s in parsed.sections if not (s.optional and not options.include_optional)]
     headings_pool = headings_pool or [l.title for l in all_links if l.title]
     description, keywords = generate_keywords(
         parsed.title,
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from .util import cache_dir, write_json
+
+
+DEFAULT_TTL = 3600
+# Room for two full "verbose" crawls (max_pages 1200, max_total_bytes 250 MB),
+# so one large site never evicts its own pages between runs.
+DEFAULT_MAX_BYTES = 500_000_000
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+
+def _cache_directives(value: Optional[str]) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+class DiskCache:
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+    ) -> None:
+        self._directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    @property
+    def directory(self) -> str:
+        # Resolved per call so SKILLGEN_CACHE_DIR / HOME changes are honoured.
+        return self._directory or os.path.join(cache_dir(), "http")
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("url") != url or not isinstance(entry.get("text"), str):
+            return None
+        if not isinstance(entry.get("bytes"), int):
+            entry["bytes"] = len(entry["text"].encode("utf-8"))
+        return entry
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        stored_at = entry.get("stored_at")
+        if not isinstance(stored_at, (int, float)):
+            return False
+        lifetime = self.ttl
+        directives = _cache_directives(entry.get("cache_control"))
+        if "no-cache" in directives:
+            return False
+        try:
+            lifetime = min(lifetime, int(directives["max-age"] or ""))
+        except (KeyError, ValueError):
+            pass
+        return time.time() - stored_at < lifetime
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(
+        self,
+        url: str,
+        text: str,
+        content_type: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        nbytes: Optional[int] = None,
+        cache_control: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        entry = {
+            "url": url,
+            "text": text,
+            "content_type": content_type,
+            "etag": etag,
+            "last_modified": last_modified,
+            "bytes": len(text.encode("utf-8")) if nbytes is None else nbytes,
+            "cache_control": cache_control,
+            "stored_at": time.time(),
+        }
+        path = self._path(url)
+        try:
+            if "no-store" in _cache_directives(cache_control):
+                # Drop any earlier copy too; the server no longer allows storing it.
+                os.remove(path)
+            else:
+                write_json(path, entry)
+        except OSError:
+            pass
+        return entry
+
+    def prune(self) -> None:
+        # Not called per put: callers prune once after a batch of writes.
+        # Entries past max_age go first, then the least recently stored ones
+        # until the directory fits in max_bytes.
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for item in it:
+                    if not item.name.endswith(".json"):
+                        continue
+                    try:
+                        st = item.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, item.path))
+        except OSError:
+            return
+        entries.sort(reverse=True)
+        cutoff = time.time() - self.max_age
+        total = 0
+        for mtime, size, path in entries:
+            total += size
+            if total > self.max_bytes or mtime < cutoff:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def refresh(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        # A 304 confirms the cached body; restart its TTL.
+        return self.put(
+            entry["url"],
+            entry["text"],
+            entry.get("content_type"),
+            entry.get("etag"),
+            entry.get("last_modified"),
+            entry.get("bytes"),
+            entry.get("cache_control"),
+        )
@@ -1,5 +1,13 @@
 import os
 import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+
+_dest_locks: Dict[str, threading.Lock] = {}
+_dest_locks_guard = threading.Lock()
 
 
 def resolve_install_dir(for_claude: bool = False) -> str:
@@ -9,7 +17,84 @@ def resolve_install_dir(for_claude: bool = False) -> str:
     return os.path.join(home, ".agents", "skills")
 
 
-def install_skill(output_root: str, skill_name: str, for_claude: bool = False) -> str:
+def _parallel_copytree(src: str, dest: str, workers: int = 8) -> None:
+    jobs = []
+    dirs = []
+    for root, _, files in os.walk(src):
+        rel = os.path.relpath(root, src)
+        target_root = dest if rel == os.curdir else os.path.join(dest, rel)
+        os.makedirs(target_root, exist_ok=True)
+        dirs.append((root, target_root))
+        for name in files:
+            jobs.append((os.path.join(root, name), os.path.join(target_root, name)))
+    # File copies block on I/O and release the GIL, so threads overlap them.
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda job: shutil.copy2(*job), jobs))
+    # Like copytree: directory modes and times are copied once their files are
+    # in place. This also replaces mkdtemp's 0700 on the staging root.
+    for src_dir, dest_dir in dirs:
+        shutil.copystat(src_dir, dest_dir)
+
+
+def _link_or_copytree(src: str, dest: str) -> None:
+    try:
+        shutil.copytree(src, dest, copy_function=os.link, dirs_exist_ok=True)
+    except OSError:
+        shutil.rmtree(dest, ignore_errors=True)
+        _parallel_copytree(src, dest)
+
+
+def _same_filesystem(path: str, other: str) -> bool:
+    try:
+        return os.stat(path).st_dev == os.stat(other).st_dev
+    except OSError:
+        return False
+
+
+def _dest_lock(dest: str) -> threading.Lock:
+    with _dest_locks_guard:
+        return _dest_locks.setdefault(dest, threading.Lock())
+
+
+def _install(output_root: str, dest: str, resolved_dir: str, skill_name: str, allow_move: bool) -> str:
+    # The caller no longer needs output_root, so try a plain rename first.
+    # Renames and hard links both fail across devices; skip them up front.
+    same_fs = allow_move and _same_filesystem(output_root, resolved_dir)
+    if same_fs:
+        if os.path.exists(dest):
+            shutil.rmtree(dest)
+        try:
+            os.rename(output_root, dest)
+            return dest
+        except OSError:
+            pass
+
+    # Build the copy in a hidden sibling and swap it in, so an interrupted
+    # install never leaves a half-written skill at dest.
+    staging = tempfile.mkdtemp(prefix=f".{skill_name}-", dir=resolved_dir)
+    try:
+        if same_fs:
+            _link_or_copytree(output_root, staging)
+        else:
+            _parallel_copytree(output_root, staging)
+        if os.path.exists(dest):
+            shutil.rmtree(dest)
+        os.replace(staging, dest)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if allow_move:
+        shutil.rmtree(output_root, ignore_errors=True)
+    return dest
+
+
+def install_skill(
+    output_root: str,
+    skill_name: str,
+    for_claude: bool = False,
+    allow_move: bool = False,
+) -> str:
     resolved_dir = resolve_install_dir(for_claude=for_claude)
     os.makedirs(resolved_dir, exist_ok=True)
     dest = os.path.join(resolved_dir, skill_name)
@@ -18,8 +103,7 @@ def install_skill(output_root: str, skill_name: str, for_claude: bool = False) -
     if src_real == dest_real:
         return dest
 
-    if os.path.exists(dest):
-        shutil.rmtree(dest)
-
-    shutil.copytree(output_root, dest)
-    return dest
+    # Concurrent installs of the same skill name (e.g. batch tool calls) would
+    # otherwise remove each other's files mid-swap.
+    with _dest_lock(dest_real):
+        return _install(output_root, dest, resolved_dir, skill_name, allow_move)
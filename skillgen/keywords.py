@@ -1,13 +1,26 @@
+import heapq
 import re
+import sys
 from collections import Counter
-from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
 
+try:
+    import ahocorasick
+except ImportError:  # optional: pip install skillgen[extras]
+    ahocorasick = None
 
-_STOPWORDS = {
+
+_STOPWORDS = frozenset(sys.intern(w) for w in (
     "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "he", "in",
     "is", "it", "its", "of", "on", "or", "that", "the", "to", "was", "were", "will",
     "with", "this", "these", "those", "you", "your", "we", "our", "their", "they", "via",
-}
+))
+
+_SPLIT_RE = re.compile(r"[^a-zA-Z0-9]+")
+_STRIP_CHARS = ".,:;!?()[]{}<>\"'"
 
 _GENERIC_INTENTS = [
     "authentication", "auth", "login", "api key", "rate limit", "pagination",
@@ -36,12 +49,34 @@ _INTENT_HINTS = {
     "monitoring": {"monitor", "observability", "metrics", "tracing", "logging"},
     "troubleshooting": {"troubleshoot", "debug", "known issues", "faq"},
 }
+_INTENT_HINTS = {
+    sys.intern(intent): frozenset(sys.intern(hint) for hint in hints)
+    for intent, hints in _INTENT_HINTS.items()
+}
+
+
+def _build_intent_automaton():
+    if ahocorasick is None:
+        return None
+    hint_intents: Dict[str, List[str]] = {}
+    for intent, hints in _INTENT_HINTS.items():
+        for hint in hints:
+            hint_intents.setdefault(hint, []).append(intent)
+    automaton = ahocorasick.Automaton()
+    for hint, intents in hint_intents.items():
+        automaton.add_word(hint, tuple(intents))
+    automaton.make_automaton()
+    return automaton
+
+
+_INTENT_AUTOMATON = _build_intent_automaton()
 
 
-def _heuristic_profile(level: str) -> Dict[str, object]:
+@lru_cache(maxsize=8)
+def _heuristic_profile(level: str) -> Mapping[str, object]:
     normalized = (level or "balanced").strip().lower()
     if normalized == "compact":
-        return {
+        return MappingProxyType({
             "max_terms": 60,
             "heading_input": 80,
             "seed_sections": 8,
@@ -52,9 +87,9 @@ def _heuristic_profile(level: str) -> Dict[str, object]:
             "include_themes": False,
             "include_detected_intents": True,
             "generic_intent_limit": 8,
-        }
+        })
     if normalized == "verbose":
-        return {
+        return MappingProxyType({
             "max_terms": 60,
             "heading_input": 300,
             "seed_sections": 24,
@@ -65,8 +100,8 @@ def _heuristic_profile(level: str) -> Dict[str, object]:
             "include_themes": True,
             "include_detected_intents": True,
             "generic_intent_limit": 8,
-        }
-    return {
+        })
+    return MappingProxyType({
         "max_terms": 60,
         "heading_input": 180,
         "seed_sections": 16,
@@ -77,48 +112,81 @@ def _heuristic_profile(level: str) -> Dict[str, object]:
         "include_themes": True,
         "include_detected_intents": True,
         "generic_intent_limit": 8,
-    }
+    })
 
 
 def _tokenize(text: str) -> List[str]:
-    tokens = re.split(r"[^a-zA-Z0-9]+", text.lower())
-    return [t for t in tokens if t and t not in _STOPWORDS and len(t) > 2]
+    tokens = _SPLIT_RE.split(text.lower())
+    return [t for t in tokens if len(t) > 2 and t not in _STOPWORDS]
 
 
 def _normalize_space(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
+    # str.split() treats the same characters as whitespace as \s, and the
+    # join drops leading/trailing runs, so no regex pass is needed.
+    return " ".join(text.split())
 
 
 def _normalize_term(text: str) -> str:
-    cleaned = _normalize_space(text.lower())
-    cleaned = cleaned.strip(".,:;!?()[]{}<>\"'")
-    return cleaned
+    return " ".join(text.lower().split()).strip(_STRIP_CHARS)
 
 
-def _phrase_ngrams(tokens: List[str], min_n: int = 2, max_n: int = 3) -> List[str]:
-    phrases: List[str] = []
-    for n in range(min_n, max_n + 1):
-        if len(tokens) < n:
-            continue
-        for i in range(0, len(tokens) - n + 1):
-            phrase = " ".join(tokens[i : i + n])
-            if len(phrase) >= 6:
-                phrases.append(phrase)
-    return phrases
-
-
-def _add_weight(counter: Counter[str], term: str, weight: int) -> None:
+def _add_weight(counter: Counter[str], term: str, weight: int) -> str:
     normalized = _normalize_term(term)
     if not normalized:
-        return
+        return normalized
     if normalized in _STOPWORDS:
-        return
+        return normalized
     words = normalized.split()
     if len(words) > 8:
-        return
+        return normalized
     if len(normalized) > 80:
-        return
+        return normalized
     counter[normalized] += weight
+    return normalized
+
+
+def _add_token_weights(counter: Counter[str], terms: List[str], weight: int) -> None:
+    # Tokens (and phrases joined from them) are already lowercase, stripped
+    # and stopword-free, so only the length cap from _add_weight still applies.
+    # Counting in C first means the weight is applied once per distinct term.
+    for term, occurrences in Counter(terms).items():
+        if len(term) <= 80:
+            counter[term] += occurrences * weight
+
+
+def _ingest(
+    counter: Counter[str],
+    items: Iterable[str],
+    item_weight: int,
+    token_weight: int,
+    phrase_weight: int = 0,
+    item_terms: Optional[Set[str]] = None,
+    token_terms: Optional[Set[str]] = None,
+) -> None:
+    all_tokens: List[str] = []
+    phrases: List[str] = []
+    for item in items:
+        normalized = _add_weight(counter, item, item_weight)
+        if item_terms is not None:
+            item_terms.add(normalized)
+        tokens = _tokenize(item)
+        if token_terms is not None:
+            token_terms.update(tokens)
+        all_tokens.extend(tokens)
+        if not phrase_weight:
+            continue
+        # Emit the 2- and 3-token phrases ending at each token.
+        for i in range(1, len(tokens)):
+            bigram = tokens[i - 1] + " " + tokens[i]
+            if len(bigram) >= 6:
+                phrases.append(bigram)
+            if i >= 2:
+                trigram = tokens[i - 2] + " " + bigram
+                if len(trigram) >= 6:
+                    phrases.append(trigram)
+    _add_token_weights(counter, all_tokens, token_weight)
+    if phrases:
+        _add_token_weights(counter, phrases, phrase_weight)
 
 
 def _collect_weighted_terms(
@@ -126,48 +194,37 @@ def _collect_weighted_terms(
     summary: Optional[str],
     sections: List[str],
     headings: List[str],
-) -> Counter[str]:
+) -> Tuple[Counter[str], Set[str], Set[str]]:
     counter: Counter[str] = Counter()
-
-    _add_weight(counter, title, 14)
-    title_tokens = _tokenize(title)
-    for token in title_tokens:
-        _add_weight(counter, token, 5)
-    for phrase in _phrase_ngrams(title_tokens):
-        _add_weight(counter, phrase, 6)
-
+    title_tokens: Set[str] = set()
+    section_terms: Set[str] = set()
+    _ingest(counter, [title], 14, 5, 6, token_terms=title_tokens)
     if summary:
-        _add_weight(counter, summary, 9)
-        summary_tokens = _tokenize(summary)
-        for token in summary_tokens:
-            _add_weight(counter, token, 3)
-
-    for section in sections:
-        _add_weight(counter, section, 11)
-        section_tokens = _tokenize(section)
-        for token in section_tokens:
-            _add_weight(counter, token, 4)
-        for phrase in _phrase_ngrams(section_tokens):
-            _add_weight(counter, phrase, 5)
-
-    for heading in headings[:250]:
-        _add_weight(counter, heading, 7)
-        heading_tokens = _tokenize(heading)
-        for token in heading_tokens:
-            _add_weight(counter, token, 2)
-        for phrase in _phrase_ngrams(heading_tokens):
-            _add_weight(counter, phrase, 3)
-
-    return counter
+        _ingest(counter, [summary], 9, 3)
+    _ingest(counter, sections, 11, 4, 5, item_terms=section_terms)
+    _ingest(counter, headings[:250], 7, 2, 3)
+    return counter, title_tokens, section_terms
 
 
 def _ranked_terms(counter: Counter[str], max_terms: int) -> List[str]:
-    ranked = sorted(counter.items(), key=lambda item: (-item[1], -len(item[0]), item[0]))
-    return [term for term, _ in ranked[:max_terms]]
+    # Terms are unique, so comparing the decorated tuples directly gives the
+    # same order as a key function without a per-item lambda call.
+    ranked = heapq.nsmallest(max_terms, [(-weight, -len(term), term) for term, weight in counter.items()])
+    return [term for _, _, term in ranked]
+
 
+def _intent_corpus(summary: Optional[str], sections: List[str], headings: List[str]) -> str:
+    return " ".join([summary or "", *sections, *headings]).lower()
 
-def _detect_intents(summary: Optional[str], sections: List[str], headings: List[str]) -> List[str]:
-    corpus = " ".join([summary or "", *sections, *headings]).lower()
+
+def _detect_intents(corpus: str) -> List[str]:
+    if _INTENT_AUTOMATON is not None:
+        found: Set[str] = set()
+        for _, hint_intents in _INTENT_AUTOMATON.iter(corpus):
+            found.update(hint_intents)
+            if len(found) == len(_INTENT_HINTS):
+                break
+        return [intent for intent in _INTENT_HINTS if intent in found]
     intents = []
     for intent, hints in _INTENT_HINTS.items():
         if any(hint in corpus for hint in hints):
@@ -177,52 +234,83 @@ def _detect_intents(summary: Optional[str], sections: List[str], headings: List[
 
 def _dedupe_terms(terms: List[str]) -> List[str]:
     ordered: List[str] = []
+    seen = set()
+    # Normalized terms never contain newlines, so one substring scan over this
+    # view finds any kept term that contains the candidate.
+    haystack = ""
+    long_phrases: List[str] = []
     for term in terms:
         cleaned = _normalize_term(term)
         if not cleaned:
             continue
         if cleaned.isdigit():
             continue
-
-        skip = False
+        if cleaned in seen:
+            continue
+        if len(cleaned) >= 6 and cleaned in haystack:
+            continue
         cleaned_is_phrase = " " in cleaned
-        for existing in ordered:
-            existing_is_phrase = " " in existing
-            if cleaned == existing:
-                skip = True
-                break
-            if len(cleaned) >= 6 and cleaned in existing:
-                skip = True
-                break
-            if cleaned_is_phrase and existing_is_phrase and len(existing) >= 6 and existing in cleaned:
-                skip = True
-                break
-        if skip:
+        if cleaned_is_phrase and any(phrase in cleaned for phrase in long_phrases):
             continue
         ordered.append(cleaned)
+        seen.add(cleaned)
+        haystack += "\n" + cleaned
+        if cleaned_is_phrase and len(cleaned) >= 6:
+            long_phrases.append(cleaned)
     return ordered
 
 
+@dataclass
+class _PreparedContext:
+    ranked: List[str]
+    title_tokens: Set[str]
+    section_terms: Set[str]
+    intents: List[str]
+    section_intents: List[str]
+
+
+def _prepare(
+    title: str,
+    summary: Optional[str],
+    sections: List[str],
+    headings: List[str],
+    level: str,
+) -> _PreparedContext:
+    profile = _heuristic_profile(level)
+    heading_input = headings[: int(profile["heading_input"])]
+    counter, title_tokens, section_terms = _collect_weighted_terms(title, summary, sections, heading_input)
+    section_corpus = _intent_corpus(summary, sections, [])
+    corpus = section_corpus
+    if heading_input:
+        corpus = section_corpus + " " + " ".join(heading_input).lower()
+    return _PreparedContext(
+        ranked=_ranked_terms(counter, int(profile["max_terms"]) * 2),
+        title_tokens=title_tokens,
+        section_terms=section_terms,
+        intents=_detect_intents(corpus),
+        section_intents=_detect_intents(section_corpus),
+    )
+
+
 def heuristic_keywords(
     title: str,
     summary: Optional[str],
     sections: List[str],
     headings: List[str],
     level: str = "balanced",
+    ctx: Optional[_PreparedContext] = None,
 ) -> List[str]:
     profile = _heuristic_profile(level)
     max_terms = int(profile["max_terms"])
-    heading_input = int(profile["heading_input"])
-
-    counter = _collect_weighted_terms(title, summary, sections, headings[:heading_input])
+    if ctx is None:
+        ctx = _prepare(title, summary, sections, headings, level)
 
     seeded: List[str] = []
     seeded.extend(sections[: int(profile["seed_sections"])])
     seeded.extend(headings[: int(profile["seed_headings"])])
-    ranked = _ranked_terms(counter, max_terms * 2)
-    intents = _detect_intents(summary, sections, headings[:heading_input])[: int(profile["intent_cap"])]
+    intents = ctx.intents[: int(profile["intent_cap"])]
 
-    terms = _dedupe_terms(seeded + ranked)
+    terms = _dedupe_terms(seeded + ctx.ranked)
     if profile["include_detected_intents"]:
         terms = _dedupe_terms(terms + intents)
     generic_limit = int(profile["generic_intent_limit"])
@@ -251,6 +339,7 @@ def heuristic_description(
     sections: List[str],
     headings: List[str],
     level: str = "balanced",
+    ctx: Optional[_PreparedContext] = None,
 ) -> str:
     profile = _heuristic_profile(level)
     if summary:
@@ -269,15 +358,14 @@ def heuristic_description(
     if not profile["include_themes"]:
         return "\n\n".join(paragraphs)
 
-    counter = _collect_weighted_terms(title, summary, sections, headings[: int(profile["heading_input"])])
-    section_terms = {_normalize_term(s) for s in sections}
-    title_tokens = set(_tokenize(title))
+    if ctx is None:
+        ctx = _prepare(title, summary, sections, headings, level)
 
     themes: List[str] = []
-    for term in _ranked_terms(counter, 50):
-        if term in section_terms:
+    for term in ctx.ranked[:50]:
+        if term in ctx.section_terms:
             continue
-        if term in title_tokens:
+        if term in ctx.title_tokens:
             continue
         if " " not in term and len(term) < 8:
             continue
@@ -287,8 +375,8 @@ def heuristic_description(
     themes = _dedupe_terms(themes)
 
     intents = [
-        intent for intent in _detect_intents(summary, sections, [])
-        if _normalize_term(intent) not in section_terms
+        intent for intent in ctx.section_intents
+        if _normalize_term(intent) not in ctx.section_terms
     ][: int(profile["intent_cap"])]
 
     if themes and intents:
@@ -319,6 +407,14 @@ def generate_keywords(
     headings: List[str],
     heuristic_level: str,
 ) -> Tuple[str, List[str]]:
-    description = heuristic_description(title, summary, sections, headings, level=heuristic_level)
-    keywords = heuristic_keywords(title, summary, sections, headings, level="balanced")
+    # Keywords always use the balanced profile; the description shares that
+    # work whenever its own profile is the same.
+    ctx = _prepare(title, summary, sections, headings, "balanced")
+    description_ctx = None
+    if _heuristic_profile(heuristic_level) == _heuristic_profile("balanced"):
+        description_ctx = ctx
+    description = heuristic_description(
+        title, summary, sections, headings, level=heuristic_level, ctx=description_ctx
+    )
+    keywords = heuristic_keywords(title, summary, sections, headings, level="balanced", ctx=ctx)
     return description, keywords
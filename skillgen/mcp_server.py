@@ -1,31 +1,207 @@
+import dataclasses
+import hashlib
+import json
 import os
+import shutil
 import tempfile
-from typing import Literal, Optional
-
-from mcp.server.fastmcp import FastMCP
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from importlib import metadata
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Tuple
 
 from .config import load_config, limits_for_level
-from .fetcher import discover_llms_url, fetch_text, fetch_documents
+from .fetcher import discover_and_fetch, discover_llms_url, fetch_documents, fetch_text
 from .parser import parse_llms_text
 from .generator import generate_skill
 from .installer import install_skill, resolve_install_dir
-from .models import GeneratorOptions
+from .models import GeneratorOptions, ParsedLlms
+from .util import cache_dir, ensure_dir, slugify
 
 
-mcp = FastMCP(
-    name="skillgen",
-    instructions="""Generate Agent Skills from llms.txt documentation files.
+_INSTRUCTIONS = """Generate Agent Skills from llms.txt documentation files.
 
 Defaults:
 - Install to ~/.agents/skills
 - Use heuristic keyword/description generation
 - Use balanced preset limits
 
-Set for_claude=true to install to ~/.claude/skills.""",
-)
+Set for_claude=true to install to ~/.claude/skills."""
+
+_TOOLS: List[Callable[..., dict]] = []
+
+
+def _tool(fn: Callable[..., dict]) -> Callable[..., dict]:
+    _TOOLS.append(fn)
+    return fn
+
+
+@lru_cache(maxsize=1)
+def _build_server():
+    # The MCP SDK is only imported once a server is actually needed.
+    from mcp.server.fastmcp import FastMCP
+
+    server = FastMCP(name="skillgen", instructions=_INSTRUCTIONS)
+    for fn in _TOOLS:
+        server.tool()(fn)
+    return server
+
+
+def __getattr__(name: str) -> Any:
+    if name == "mcp":
+        return _build_server()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=1)
+def _config() -> Dict[str, Any]:
+    # Config is read once per server process; handlers only read from it.
+    return load_config(None)
+
+
+@contextmanager
+def _working_dir(output_dir: Optional[str], scratch_root: Optional[str] = None) -> Iterator[str]:
+    if output_dir is not None:
+        yield output_dir
+        return
+    # Scratch space for one call; removed once the skill has been installed.
+    # Keeping it under the install root lets the install be a same-filesystem
+    # rename instead of a copy.
+    if scratch_root:
+        ensure_dir(scratch_root)
+    with tempfile.TemporaryDirectory(prefix=".skillgen-", dir=scratch_root) as tmp:
+        yield tmp
+
+
+# Where each site's llms.txt was found, keyed on (base_url, user_agent).
+# Filled from whichever call found it, so a cold lookup downloads the body
+# once instead of probing and then fetching it again.
+_LLMS_LOCATIONS_MAX = 256
+_llms_locations: Dict[Tuple[str, str], str] = {}
+_llms_locations_guard = threading.Lock()
+
+
+def _remember_location(key: Tuple[str, str], llms_url: str) -> None:
+    with _llms_locations_guard:
+        _llms_locations.pop(key, None)
+        if len(_llms_locations) >= _LLMS_LOCATIONS_MAX:
+            del _llms_locations[next(iter(_llms_locations))]
+        _llms_locations[key] = llms_url
+
+
+def _discover_cached(base_url: str, user_agent: str) -> str:
+    llms_url = _llms_locations.get((base_url, user_agent))
+    if llms_url is None:
+        llms_url = discover_llms_url(base_url, user_agent)
+        _remember_location((base_url, user_agent), llms_url)
+    return llms_url
+
 
+def _resolve_llms(source: str, user_agent: str) -> Tuple[str, str]:
+    key = (source, user_agent)
+    llms_url = _llms_locations.get(key)
+    if llms_url is not None:
+        # The body itself comes from the HTTP cache when still fresh.
+        try:
+            return llms_url, fetch_text(llms_url, user_agent)
+        except RuntimeError:
+            # The remembered location stopped serving llms.txt; probe again.
+            with _llms_locations_guard:
+                _llms_locations.pop(key, None)
+    llms_url, text = discover_and_fetch(source, user_agent)
+    _remember_location(key, llms_url)
+    return llms_url, text
 
-@mcp.tool()
+
+@lru_cache(maxsize=32)
+def _parse_cached(text: str, source_url: Optional[str]) -> ParsedLlms:
+    # Keyed on the text itself: str caches its hash and a hit costs one
+    # memcmp, cheaper than digesting the text on every call.
+    return parse_llms_text(text, source_url=source_url)
+
+
+# Generated skills carry timestamps, so cached copies are only reused for an
+# hour, and only the most recent few are kept on disk.
+_SKILL_CACHE_TTL = 3600
+_SKILL_CACHE_MAX = 16
+
+
+@lru_cache(maxsize=None)
+def _skillgen_version() -> str:
+    try:
+        return metadata.version("skillgen")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _skill_cache_key(llms_text: str, options: GeneratorOptions) -> str:
+    params = dataclasses.asdict(options)
+    # Where the skill is written or installed does not change its contents.
+    for key in ("output_dir", "install_for_claude", "config_path"):
+        params.pop(key, None)
+    # A new skillgen release may render the same input differently.
+    payload = _skillgen_version() + "\0" + llms_text + "\0" + json.dumps(params, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_generated_skill(path: str) -> bool:
+    try:
+        with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+            return isinstance(json.load(f), dict)
+    except (OSError, ValueError):
+        return False
+
+
+def _is_fresh_slot(slot: str) -> bool:
+    try:
+        return time.time() - os.stat(slot).st_mtime < _SKILL_CACHE_TTL
+    except OSError:
+        return False
+
+
+def _prune_skill_cache(skills_cache: str, keep: str) -> None:
+    try:
+        with os.scandir(skills_cache) as it:
+            slots = [e.path for e in it if e.is_dir(follow_symlinks=False) and not e.name.startswith(".")]
+    except OSError:
+        return
+    slots = [s for s in slots if s != keep]
+    fresh = sorted((s for s in slots if _is_fresh_slot(s)), key=os.path.getmtime, reverse=True)
+    for slot in set(slots) - set(fresh[: _SKILL_CACHE_MAX - 1]):
+        shutil.rmtree(slot, ignore_errors=True)
+
+
+def _generate_cached(parsed: ParsedLlms, options: GeneratorOptions, llms_text: str) -> str:
+    skills_cache = os.path.join(cache_dir(), "skills")
+    slot = os.path.join(skills_cache, _skill_cache_key(llms_text, options))
+    output_path = os.path.join(slot, slugify(options.name_override or parsed.title))
+    if _is_fresh_slot(slot) and _is_generated_skill(output_path):
+        return output_path
+
+    ensure_dir(skills_cache)
+    staging = tempfile.mkdtemp(prefix=".staging-", dir=skills_cache)
+    try:
+        generate_skill(parsed, dataclasses.replace(options, output_dir=staging), None)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    try:
+        if os.path.exists(slot):
+            shutil.rmtree(slot, ignore_errors=True)
+        os.rename(staging, slot)
+        os.utime(slot)
+    except OSError:
+        # Another call may have filled the slot first; fall back to its copy.
+        shutil.rmtree(staging, ignore_errors=True)
+        if not _is_generated_skill(output_path):
+            raise
+    _prune_skill_cache(skills_cache, keep=slot)
+    return output_path
+
+
+@_tool
 def generate_skill_from_url(
     source_url: str,
     output_dir: Optional[str] = None,
@@ -36,20 +212,40 @@ def generate_skill_from_url(
     heuristic_level: Literal["compact", "balanced", "verbose"] = "balanced",
     for_claude: bool = False,
 ) -> dict:
-    cfg = load_config(None)
+    llms_url, text = _resolve_llms(source_url, _config().get("user_agent", "SkillGen/0.1"))
+    return _generate_from_llms(
+        llms_url,
+        text,
+        output_dir=output_dir,
+        name=name,
+        include_optional=include_optional,
+        snapshot=snapshot,
+        allow_external=allow_external,
+        heuristic_level=heuristic_level,
+        for_claude=for_claude,
+    )
 
-    if output_dir is None:
-        output_dir = tempfile.mkdtemp(prefix="skillgen_")
+
+def _generate_from_llms(
+    llms_url: str,
+    text: str,
+    output_dir: Optional[str],
+    name: Optional[str],
+    include_optional: bool,
+    snapshot: bool,
+    allow_external: bool,
+    heuristic_level: Literal["compact", "balanced", "verbose"],
+    for_claude: bool,
+) -> dict:
+    cfg = _config()
 
     limits = limits_for_level(heuristic_level)
     user_agent = cfg.get("user_agent", "SkillGen/0.1")
 
-    llms_url = discover_llms_url(source_url, user_agent)
-    text = fetch_text(llms_url, user_agent)
-    parsed = parse_llms_text(text, source_url=llms_url)
+    parsed = _parse_cached(text, llms_url)
 
     options = GeneratorOptions(
-        output_dir=output_dir,
+        output_dir=output_dir or "",
         name_override=name,
         include_optional=include_optional,
         snapshot=snapshot,
@@ -68,7 +264,7 @@ def generate_skill_from_url(
     fetch_result = None
     if snapshot:
         fetch_result = fetch_documents(
-            links=[l for s in parsed.sections for l in s.links],
+            links=parsed.links,
             base_url=llms_url,
             include_optional=include_optional,
             allow_external=allow_external,
@@ -77,14 +273,21 @@ def generate_skill_from_url(
             max_bytes_per_doc=options.max_bytes_per_doc,
             max_total_bytes=options.max_total_bytes,
             user_agent=user_agent,
+            deadline=cfg.get("fetch_deadline"),
         )
 
-    output_path = generate_skill(parsed, options, fetch_result)
-    install_path = install_skill(
-        output_path,
-        os.path.basename(output_path),
-        for_claude=for_claude,
-    )
+    owns_output = output_dir is None
+    install_root = resolve_install_dir(for_claude=for_claude)
+    with _working_dir(output_dir, install_root) as work_dir:
+        output_path = generate_skill(parsed, dataclasses.replace(options, output_dir=work_dir), fetch_result)
+        install_path = install_skill(
+            output_path,
+            os.path.basename(output_path),
+            for_claude=for_claude,
+            allow_move=owns_output,
+        )
+    if owns_output:
+        output_path = install_path
 
     return {
         "success": True,
@@ -92,14 +295,77 @@ def generate_skill_from_url(
         "source_url": llms_url,
         "output_path": output_path,
         "install_path": install_path,
-        "install_root": resolve_install_dir(for_claude=for_claude),
-        "sections": [s.title for s in parsed.sections],
-        "link_count": sum(len(s.links) for s in parsed.sections),
+        "install_root": install_root,
+        "sections": list(parsed.section_titles),
+        "link_count": parsed.link_count,
         "warnings": fetch_result.warnings if fetch_result else [],
     }
 
 
-@mcp.tool()
+@_tool
+def generate_skills_from_urls(
+    source_urls: List[str],
+    include_optional: bool = False,
+    snapshot: bool = True,
+    allow_external: bool = False,
+    heuristic_level: Literal["compact", "balanced", "verbose"] = "balanced",
+    for_claude: bool = False,
+) -> dict:
+    user_agent = _config().get("user_agent", "SkillGen/0.1")
+
+    def generate(llms_url: str, text: str) -> dict:
+        return _generate_from_llms(
+            llms_url,
+            text,
+            output_dir=None,
+            name=None,
+            include_optional=include_optional,
+            snapshot=snapshot,
+            allow_external=allow_external,
+            heuristic_level=heuristic_level,
+            for_claude=for_claude,
+        )
+
+    def failed(url: str, error: str) -> dict:
+        return {"success": False, "error": error, "source_url": url}
+
+    urls = list(dict.fromkeys(source_urls))
+    slots: List[Any] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(urls)))) as pool:
+        resolving = [pool.submit(_resolve_llms, url, user_agent) for url in urls]
+        # Sites whose titles slugify alike would install over one another;
+        # the first URL in the batch keeps the name and later ones fail.
+        claimed: Dict[str, str] = {}
+        for url, future in zip(urls, resolving):
+            try:
+                llms_url, text = future.result()
+                slug = slugify(_parse_cached(text, llms_url).title)
+            except Exception as e:
+                slots.append(failed(url, str(e)))
+                continue
+            if slug in claimed:
+                slots.append(failed(url, f"skill name '{slug}' is already taken by {claimed[slug]} in this batch"))
+                continue
+            claimed[slug] = url
+            slots.append(pool.submit(generate, llms_url, text))
+        results = []
+        for url, slot in zip(urls, slots):
+            if isinstance(slot, dict):
+                results.append(slot)
+                continue
+            try:
+                results.append(slot.result())
+            except Exception as e:
+                results.append(failed(url, str(e)))
+    failures = [r for r in results if not r["success"]]
+    return {
+        "results": results,
+        "success_count": len(results) - len(failures),
+        "failures": failures,
+    }
+
+
+@_tool
 def generate_skill_from_text(
     llms_text: str,
     output_dir: Optional[str] = None,
@@ -108,16 +374,13 @@ def generate_skill_from_text(
     heuristic_level: Literal["compact", "balanced", "verbose"] = "balanced",
     for_claude: bool = False,
 ) -> dict:
-    cfg = load_config(None)
-
-    if output_dir is None:
-        output_dir = tempfile.mkdtemp(prefix="skillgen_")
+    cfg = _config()
 
     limits = limits_for_level(heuristic_level)
-    parsed = parse_llms_text(llms_text, source_url=None)
+    parsed = _parse_cached(llms_text, None)
 
     options = GeneratorOptions(
-        output_dir=output_dir,
+        output_dir=output_dir or "",
         name_override=name,
         include_optional=include_optional,
         snapshot=False,
@@ -133,7 +396,11 @@ def generate_skill_from_text(
         config_path=None,
     )
 
-    output_path = generate_skill(parsed, options, None)
+    # Text input is deterministic, so identical requests reuse a cached skill.
+    if output_dir is None:
+        output_path = _generate_cached(parsed, options, llms_text)
+    else:
+        output_path = generate_skill(parsed, options, None)
     install_path = install_skill(
         output_path,
         os.path.basename(output_path),
@@ -146,24 +413,23 @@ def generate_skill_from_text(
         "output_path": output_path,
         "install_path": install_path,
         "install_root": resolve_install_dir(for_claude=for_claude),
-        "sections": [s.title for s in parsed.sections],
-        "link_count": sum(len(s.links) for s in parsed.sections),
+        "sections": list(parsed.section_titles),
+        "link_count": parsed.link_count,
     }
 
 
-@mcp.tool()
+@_tool
 def parse_llms(source: str, is_url: bool = True) -> dict:
-    cfg = load_config(None)
+    cfg = _config()
 
     if is_url:
-        llms_url = discover_llms_url(source, cfg.get("user_agent", "SkillGen/0.1"))
-        text = fetch_text(llms_url, cfg.get("user_agent", "SkillGen/0.1"))
+        llms_url, text = _resolve_llms(source, cfg.get("user_agent", "SkillGen/0.1"))
         source_url = llms_url
     else:
         text = source
         source_url = None
 
-    parsed = parse_llms_text(text, source_url=source_url)
+    parsed = _parse_cached(text, source_url)
     return {
         "title": parsed.title,
         "summary": parsed.summary,
@@ -186,16 +452,16 @@ def parse_llms(source: str, is_url: bool = True) -> dict:
             }
             for section in parsed.sections
         ],
-        "total_links": sum(len(s.links) for s in parsed.sections),
+        "total_links": parsed.link_count,
     }
 
 
-@mcp.tool()
+@_tool
 def discover_llms(base_url: str) -> dict:
-    cfg = load_config(None)
+    cfg = _config()
     user_agent = cfg.get("user_agent", "SkillGen/0.1")
     try:
-        llms_url = discover_llms_url(base_url, user_agent)
+        llms_url = _discover_cached(base_url, user_agent)
         return {
             "success": True,
             "llms_url": llms_url,
@@ -209,14 +475,16 @@ def discover_llms(base_url: str) -> dict:
         }
 
 
-@mcp.tool()
+# Plain dicts: pydantic-core serializes a MappingProxyType as its repr string.
+_PRESETS = {level: dict(limits_for_level(level)) for level in ("compact", "balanced", "verbose")}
+
+
+@_tool
 def get_config() -> dict:
-    cfg = load_config(None)
+    cfg = _config()
     return {
         "config": cfg,
-        "presets": {
-            level: limits_for_level(level) for level in ("compact", "balanced", "verbose")
-        },
+        "presets": _PRESETS,
         "install_paths": {
             "default": resolve_install_dir(for_claude=False),
             "claude": resolve_install_dir(for_claude=True),
@@ -225,7 +493,7 @@ def get_config() -> dict:
 
 
 def main():
-    mcp.run()
+    _build_server().run()
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 
+# slots= is only accepted by dataclass on 3.10+.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class DocLink:
     title: str
     url: str
@@ -13,25 +17,34 @@ class DocLink:
     section_title: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class Section:
     title: str
     slug: str
     optional: bool
-    links: List[DocLink] = field(default_factory=list)
+    links: Tuple[DocLink, ...] = ()
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ParsedLlms:
     title: str
     summary: Optional[str]
     preamble: Optional[str]
-    sections: List[Section]
+    sections: Tuple[Section, ...]
     source_url: Optional[str]
     raw_text: str
+    section_titles: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    links: Tuple[DocLink, ...] = field(init=False, repr=False, compare=False)
+    link_count: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        links = tuple(link for s in self.sections for link in s.links)
+        object.__setattr__(self, "section_titles", tuple(s.title for s in self.sections))
+        object.__setattr__(self, "links", links)
+        object.__setattr__(self, "link_count", len(links))
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FetchedDoc:
     source_url: str
     final_url: str
@@ -45,13 +58,13 @@ class FetchedDoc:
     last_modified: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FetchResult:
     docs: Dict[str, FetchedDoc]
     warnings: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class GeneratorOptions:
     output_dir: str
     name_override: Optional[str]
@@ -1,5 +1,6 @@
 import re
-from typing import Optional, List
+import sys
+from typing import List, Optional
 
 from .models import ParsedLlms, Section, DocLink
 from .util import slugify
@@ -8,60 +9,67 @@ from .util import slugify
 _h1_re = re.compile(r"^#\s+(.+?)\s*$")
 _h2_re = re.compile(r"^##\s+(.+?)\s*$")
 _link_re = re.compile(r"\[([^\]]+)\]\(([^\)]+)\)")
+_INTERN_MAX = 64
+
+
+def _section(title: str, optional: bool, links: List[DocLink]) -> Section:
+    return Section(
+        title=title,
+        slug=slugify(title, max_len=60),
+        optional=optional,
+        links=tuple(links),
+    )
 
 
 def parse_llms_text(text: str, source_url: Optional[str] = None) -> ParsedLlms:
-    lines = text.splitlines()
     title = None
     summary_lines: List[str] = []
     preamble_lines: List[str] = []
     sections: List[Section] = []
-    current_section: Optional[Section] = None
+    current_title: Optional[str] = None
+    current_optional = False
+    current_links: List[DocLink] = []
     seen_h2 = False
+    in_summary = False
 
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+    for line in text.splitlines():
+        stripped = line.strip()
+        if in_summary:
+            if stripped.startswith(">"):
+                summary_lines.append(stripped.lstrip(">").strip())
+                continue
+            if stripped == "":
+                continue
+            in_summary = False
         if title is None:
-            m = _h1_re.match(line.strip())
+            m = _h1_re.match(stripped)
             if m:
                 title = m.group(1).strip()
-                i += 1
-                while i < len(lines):
-                    s = lines[i].strip()
-                    if s.startswith(">"):
-                        summary_lines.append(s.lstrip(">").strip())
-                        i += 1
-                        continue
-                    if s == "":
-                        i += 1
-                        continue
-                    break
+                in_summary = True
                 continue
-        m2 = _h2_re.match(line.strip())
+        m2 = _h2_re.match(stripped)
         if m2:
             seen_h2 = True
-            section_title = m2.group(1).strip()
-            optional = section_title.strip().lower() == "optional"
-            current_section = Section(
-                title=section_title,
-                slug=slugify(section_title, max_len=60),
-                optional=optional,
-                links=[],
-            )
-            sections.append(current_section)
-            i += 1
+            if current_title is not None:
+                sections.append(_section(current_title, current_optional, current_links))
+            current_title = sys.intern(m2.group(1).strip())
+            current_optional = current_title.strip().lower() == "optional"
+            current_links = []
             continue
 
         if not seen_h2:
             if title is not None:
-                if line.strip() != "":
+                if stripped != "":
                     preamble_lines.append(line)
         else:
-            if current_section:
+            if current_title is not None:
                 link_match = _link_re.search(line)
                 if link_match:
                     link_title = link_match.group(1).strip()
+                    # Short titles ("Overview", "API Reference") repeat across
+                    # sections and registries; share one copy of each.
+                    if len(link_title) <= _INTERN_MAX:
+                        link_title = sys.intern(link_title)
                     link_url = link_match.group(2).strip()
                     note = None
                     after = line[link_match.end():].strip()
@@ -69,16 +77,18 @@ def parse_llms_text(text: str, source_url: Optional[str] = None) -> ParsedLlms:
                         note = after[1:].strip()
                     elif after:
                         note = after
-                    current_section.links.append(
+                    current_links.append(
                         DocLink(
                             title=link_title,
                             url=link_url,
                             note=note,
-                            optional=current_section.optional,
-                            section_title=current_section.title,
+                            optional=current_optional,
+                            section_title=current_title,
                         )
                     )
-        i += 1
+
+    if current_title is not None:
+        sections.append(_section(current_title, current_optional, current_links))
 
     if title is None:
         title = "Untitled"
@@ -90,7 +100,7 @@ def parse_llms_text(text: str, source_url: Optional[str] = None) -> ParsedLlms:
         title=title,
         summary=summary,
         preamble=preamble,
-        sections=sections,
+        sections=tuple(sections),
         source_url=source_url,
         raw_text=text,
     )
@@ -2,7 +2,8 @@ import hashlib
 import json
 import os
 import re
-from typing import Any
+from typing import Any, Optional
+from urllib.parse import urljoin, urlparse, urlunparse
 
 
 _slug_re = re.compile(r"[^a-z0-9]+")
@@ -24,12 +25,29 @@ def safe_filename(text: str, max_len: int = 80) -> str:
     return base
 
 
+def normalize_url(url: str, base_url: Optional[str] = None) -> str:
+    if base_url:
+        url = urljoin(base_url, url)
+    parsed = urlparse(url)
+    userinfo, at, host = parsed.netloc.rpartition("@")
+    parsed = parsed._replace(netloc=userinfo + at + host.lower(), fragment="")
+    return urlunparse(parsed)
+
+
+def is_same_host(url: str, base_url: str) -> bool:
+    return urlparse(url).netloc.lower() == urlparse(base_url).netloc.lower()
+
+
 def ensure_dir(path: str) -> None:
     if not path:
         return
     os.makedirs(path, exist_ok=True)
 
 
+def cache_dir() -> str:
+    return os.environ.get("SKILLGEN_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "skillgen")
+
+
 def write_text(path: str, content: str) -> None:
     ensure_dir(os.path.dirname(path))
     with open(path, "w", encoding="utf-8") as f:
@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(monkeypatch, tmp_path_factory):
+    monkeypatch.setenv("SKILLGEN_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
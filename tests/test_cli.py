@@ -3,22 +3,17 @@ import subprocess
 import sys
 from pathlib import Path
 
+import pytest
 
-def test_cli_rejects_removed_exclude_optional_flag():
+from skillgen.cli import main as cli_main
+
+
+def test_cli_rejects_removed_exclude_optional_flag(capsys):
     fixture = Path(__file__).parent / "fixtures" / "llms_sample.txt"
-    proc = subprocess.run(
-        [
-            sys.executable,
-            "-m",
-            "skillgen",
-            str(fixture),
-            "--exclude-optional",
-        ],
-        capture_output=True,
-        text=True,
-    )
-    assert proc.returncode == 2
-    assert "unrecognized arguments" in proc.stderr.lower()
+    with pytest.raises(SystemExit) as exc:
+        cli_main([str(fixture), "--exclude-optional"])
+    assert exc.value.code == 2
+    assert "unrecognized arguments" in capsys.readouterr().err.lower()
 
 
 def _run_cli(args, env=None):
@@ -31,28 +26,42 @@ def _run_cli(args, env=None):
 
 
 def _read_description_and_keywords(skill_md: Path):
-    lines = skill_md.read_text(encoding="utf-8").splitlines()
+    # Only the frontmatter description and the keyword line are decoded.
     desc = []
-    in_desc = False
-    for line in lines:
-        stripped = line.strip()
-        if stripped == "description: |":
-            in_desc = True
-            continue
-        if in_desc and stripped == "---":
-            break
-        if in_desc and stripped:
-            desc.append(stripped)
-
-    idx = lines.index("# Trigger keywords")
-    keywords = [k.strip() for k in lines[idx + 1].split(",") if k.strip()]
+    keywords = []
+    state = None
+    with open(skill_md, "rb") as f:
+        for raw in f:
+            line = raw.rstrip(b"\r\n")
+            stripped = line.strip()
+            if state == "desc":
+                if stripped == b"---":
+                    state = "post-desc"
+                elif stripped:
+                    desc.append(stripped.decode("utf-8"))
+            elif state == "keywords":
+                keywords = [k.strip() for k in line.decode("utf-8").split(",") if k.strip()]
+                break
+            elif state is None and stripped == b"description: |":
+                state = "desc"
+            elif line == b"# Trigger keywords":
+                state = "keywords"
     return " ".join(desc), keywords
 
 
-def test_cli_help_shows_simplified_surface():
-    proc = _run_cli(["--help"])
-    assert proc.returncode == 0
-    out = proc.stdout
+def _use_home(monkeypatch, tmp_path: Path) -> Path:
+    home = tmp_path / "home"
+    home.mkdir(parents=True, exist_ok=True)
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("USERPROFILE", str(home))
+    return home
+
+
+def test_cli_help_shows_simplified_surface(capsys):
+    with pytest.raises(SystemExit) as exc:
+        cli_main(["--help"])
+    assert exc.value.code == 0
+    out = capsys.readouterr().out
     assert "--include-optional" in out
     assert "--no-snapshot" in out
     assert "--allow-external" in out
@@ -66,6 +75,7 @@ def test_cli_help_shows_simplified_surface():
 
 
 def test_cli_installs_to_agents_by_default(tmp_path: Path):
+    # Runs the real `python -m skillgen` entry point once; other tests call main() directly.
     fixture = Path(__file__).parent / "fixtures" / "llms_sample.txt"
     home = tmp_path / "home"
     home.mkdir(parents=True, exist_ok=True)
@@ -79,30 +89,21 @@ def test_cli_installs_to_agents_by_default(tmp_path: Path):
     assert (home / ".agents" / "skills" / "cli-default" / "SKILL.md").exists()
 
 
-def test_cli_installs_to_claude_when_requested(tmp_path: Path):
+def test_cli_installs_to_claude_when_requested(monkeypatch, tmp_path: Path):
     fixture = Path(__file__).parent / "fixtures" / "llms_sample.txt"
-    home = tmp_path / "home"
-    home.mkdir(parents=True, exist_ok=True)
+    home = _use_home(monkeypatch, tmp_path)
     out_dir = tmp_path / "out"
-    env = os.environ.copy()
-    env["HOME"] = str(home)
-    env["USERPROFILE"] = str(home)
 
-    proc = _run_cli([str(fixture), "--out", str(out_dir), "--name", "cli-claude", "--no-snapshot", "--claude"], env=env)
-    assert proc.returncode == 0
+    cli_main([str(fixture), "--out", str(out_dir), "--name", "cli-claude", "--no-snapshot", "--claude"])
     assert (home / ".claude" / "skills" / "cli-claude" / "SKILL.md").exists()
 
 
-def test_cli_heuristic_level_changes_description_not_keywords(tmp_path: Path):
+def test_cli_heuristic_level_changes_description_not_keywords(monkeypatch, tmp_path: Path):
     fixture = Path(__file__).parent / "fixtures" / "llms_sample.txt"
-    home = tmp_path / "home"
-    home.mkdir(parents=True, exist_ok=True)
+    _use_home(monkeypatch, tmp_path)
     out_dir = tmp_path / "out"
-    env = os.environ.copy()
-    env["HOME"] = str(home)
-    env["USERPROFILE"] = str(home)
 
-    compact = _run_cli(
+    cli_main(
         [
             str(fixture),
             "--out",
@@ -112,10 +113,9 @@ def test_cli_heuristic_level_changes_description_not_keywords(tmp_path: Path):
             "--no-snapshot",
             "--heuristic-level",
             "compact",
-        ],
-        env=env,
+        ]
     )
-    verbose = _run_cli(
+    cli_main(
         [
             str(fixture),
             "--out",
@@ -125,11 +125,8 @@ def test_cli_heuristic_level_changes_description_not_keywords(tmp_path: Path):
             "--no-snapshot",
             "--heuristic-level",
             "verbose",
-        ],
-        env=env,
+        ]
     )
-    assert compact.returncode == 0
-    assert verbose.returncode == 0
 
     compact_desc, compact_keywords = _read_description_and_keywords(out_dir / "cli-compact" / "SKILL.md")
     verbose_desc, verbose_keywords = _read_description_and_keywords(out_dir / "cli-verbose" / "SKILL.md")
@@ -138,3 +135,19 @@ def test_cli_heuristic_level_changes_description_not_keywords(tmp_path: Path):
     assert compact_desc != verbose_desc
     assert "Covers:" in compact_desc
     assert "Useful navigation anchors include" in verbose_desc
+
+
+def test_cli_no_snapshot_skips_fetcher_import(monkeypatch, tmp_path: Path):
+    fixture = Path(__file__).parent / "fixtures" / "llms_sample.txt"
+    _use_home(monkeypatch, tmp_path)
+    # Forget modules earlier tests imported so main() has to import its own.
+    for name in ("skillgen.generator", "skillgen.fetcher", "skillgen.httpcache", "requests"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+        package, _, attr = name.rpartition(".")
+        if package in sys.modules:
+            monkeypatch.delattr(sys.modules[package], attr, raising=False)
+
+    cli_main([str(fixture), "--out", str(tmp_path / "out"), "--name", "cli-offline", "--no-snapshot"])
+
+    assert "skillgen.fetcher" not in sys.modules
+    assert "requests" not in sys.modules
@@ -1,4 +1,4 @@
-from skillgen.config import limits_for_level
+from skillgen.config import limits_for_level, load_config
 
 
 def test_limits_for_level_profiles_are_distinct():
@@ -14,3 +14,33 @@ def test_limits_for_level_profiles_are_distinct():
 
 def test_limits_for_level_defaults_to_balanced_for_unknown_level():
     assert limits_for_level("unknown-level") == limits_for_level("balanced")
+
+
+def test_load_config_merges_yaml_over_defaults(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    path = tmp_path / "skillgen.yaml"
+    path.write_text("heuristic_level: verbose\ndomain_allowlist:\n  - docs.example.com\n", encoding="utf-8")
+
+    cfg = load_config(str(path))
+    assert cfg["heuristic_level"] == "verbose"
+    assert cfg["domain_allowlist"] == ["docs.example.com"]
+    assert cfg["snapshot"] is True
+
+
+def test_load_config_reuses_cache_until_file_changes(monkeypatch, tmp_path):
+    monkeypatch.setenv("SKILLGEN_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "skillgen.yaml"
+    path.write_text("user_agent: First/1.0\n", encoding="utf-8")
+    assert load_config(str(path))["user_agent"] == "First/1.0"
+    assert list((tmp_path / "cache").glob("config-*.json"))
+
+    def fail_read_yaml(_path):
+        raise AssertionError("yaml should not be parsed on a cache hit")
+
+    monkeypatch.setattr("skillgen.config._read_yaml", fail_read_yaml)
+    assert load_config(str(path))["user_agent"] == "First/1.0"
+
+    monkeypatch.undo()
+    monkeypatch.setenv("SKILLGEN_CACHE_DIR", str(tmp_path / "cache"))
+    path.write_text("user_agent: Second/2.0\n", encoding="utf-8")
+    assert load_config(str(path))["user_agent"] == "Second/2.0"
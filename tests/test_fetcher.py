@@ -1,34 +1,311 @@
-from skillgen.fetcher import fetch_documents
+import os
+import threading
+import time
+
+import pytest
+import requests
+
+from skillgen.fetcher import discover_and_fetch, fetch_documents, fetch_text
+from skillgen.httpcache import DiskCache
 from skillgen.models import DocLink
 
 
-def test_fetch_documents_respects_total_byte_cap(monkeypatch):
-    links = [
-        DocLink(title="One", url="https://example.com/one"),
-        DocLink(title="Two", url="https://example.com/two"),
-        DocLink(title="Three", url="https://example.com/three"),
-    ]
+def _response(
+    text="# Page\n",
+    status=200,
+    content_type="text/markdown",
+    etag=None,
+    truncated=False,
+    cache_control=None,
+    error=None,
+):
+    # Mirrors the tuple _fetch_stream returns.
+    nbytes = len(text.encode("utf-8")) if text else 0
+    return text, content_type, etag, None, status, error, nbytes, truncated, cache_control
 
-    monkeypatch.setattr("skillgen.fetcher.markdown_candidates", lambda url: [url])
 
-    def fake_fetch_stream(session, url, max_bytes, user_agent):
-        text = "x" * max_bytes
-        return text, "text/markdown", "etag", "last-modified", 200, None, max_bytes, False
+@pytest.fixture
+def serve(monkeypatch):
+    # Routes _fetch_stream to respond(url, max_bytes=..., headers=..., session=...).
+    def install(respond):
+        def fake_fetch_stream(session, url, max_bytes, user_agent, extra_headers=None, **kwargs):
+            return respond(url, max_bytes=max_bytes, headers=dict(extra_headers or {}), session=session)
+
+        monkeypatch.setattr("skillgen.fetcher._fetch_stream", fake_fetch_stream)
+
+    return install
 
-    monkeypatch.setattr("skillgen.fetcher._fetch_stream", fake_fetch_stream)
 
-    result = fetch_documents(
-        links=links,
+def _fetch(links, **overrides):
+    options = dict(
         base_url="https://example.com/llms.txt",
         include_optional=True,
-        allow_external=True,
+        allow_external=False,
         domain_allowlist=None,
         max_pages=10,
-        max_bytes_per_doc=8,
-        max_total_bytes=10,
+        max_bytes_per_doc=100,
+        max_total_bytes=1000,
         user_agent="SkillGen/0.1",
     )
+    options.update(overrides)
+    return fetch_documents(links=links, **options)
+
+
+def test_fetch_documents_respects_total_byte_cap(monkeypatch, serve):
+    links = [
+        DocLink(title="One", url="https://example.com/one"),
+        DocLink(title="Two", url="https://example.com/two"),
+        DocLink(title="Three", url="https://example.com/three"),
+    ]
+
+    monkeypatch.setattr("skillgen.fetcher.markdown_candidates", lambda url: [url])
+    serve(lambda url, max_bytes, **_: _response("x" * max_bytes))
+
+    result = _fetch(links, allow_external=True, max_bytes_per_doc=8, max_total_bytes=10)
 
     assert sum(d.bytes for d in result.docs.values()) <= 10
     assert len(result.docs) == 2
     assert any("max_total_bytes limit reached" in w for w in result.warnings)
+
+
+def test_fetch_documents_sizes_caps_from_settled_pages(monkeypatch, serve):
+    sizes = {"https://example.com/small": 2, "https://example.com/large": 6, "https://example.com/last": 6}
+    links = [DocLink(title=url.rsplit("/", 1)[1], url=url) for url in sizes]
+
+    monkeypatch.setattr("skillgen.fetcher.markdown_candidates", lambda url: [url])
+    serve(lambda url, max_bytes, **_: _response("x" * min(sizes[url], max_bytes), truncated=sizes[url] > max_bytes))
+
+    result = _fetch(links, max_bytes_per_doc=6, max_total_bytes=10)
+
+    assert [d.bytes for d in result.docs.values()] == [2, 6, 2]
+
+
+def test_fetch_text_revalidates_cached_body_with_etag(monkeypatch, serve):
+    monkeypatch.setattr("skillgen.fetcher._http_cache", DiskCache(ttl=0))
+    seen_headers = []
+
+    def respond(url, headers, **_):
+        seen_headers.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return _response("", status=304, content_type="text/plain", etag='"v1"')
+        return _response("# Docs\n", content_type="text/plain", etag='"v1"')
+
+    serve(respond)
+
+    assert fetch_text("https://example.com/llms.txt", "SkillGen/0.1") == "# Docs\n"
+    assert fetch_text("https://example.com/llms.txt", "SkillGen/0.1") == "# Docs\n"
+    assert seen_headers == [{}, {"If-None-Match": '"v1"'}]
+
+
+def test_fetch_documents_fetches_cross_listed_links_once(monkeypatch, serve):
+    links = [
+        DocLink(title="Intro", url="https://Example.com/intro#top"),
+        DocLink(title="Other", url="https://other.example/page"),
+        DocLink(title="Intro again", url="/intro", optional=True),
+        DocLink(title="Other again", url="https://other.example/page#x"),
+    ]
+    fetched = []
+
+    monkeypatch.setattr("skillgen.fetcher.markdown_candidates", lambda url: [url])
+
+    def respond(url, **_):
+        fetched.append(url)
+        return _response()
+
+    serve(respond)
+
+    result = _fetch(links)
+
+    assert fetched == ["https://example.com/intro"]
+    assert list(result.docs) == ["https://example.com/intro"]
+    assert result.warnings == ["external link skipped: https://other.example/page"]
+
+
+def test_discover_and_fetch_returns_body_of_first_candidate(monkeypatch):
+    requested = []
+
+    def fake_fetch_text(url, user_agent, session=None):
+        requested.append(url)
+        if url.endswith("/.well-known/llms.txt"):
+            return "# Docs\n"
+        raise RuntimeError(f"failed to fetch {url}: http 404")
+
+    monkeypatch.setattr("skillgen.fetcher.fetch_text", fake_fetch_text)
+
+    assert discover_and_fetch("https://example.com/", "SkillGen/0.1") == (
+        "https://example.com/.well-known/llms.txt",
+        "# Docs\n",
+    )
+    assert requested == ["https://example.com/llms.txt", "https://example.com/.well-known/llms.txt"]
+
+
+def test_fetch_documents_abandons_fetches_past_deadline(monkeypatch, serve):
+    links = [
+        DocLink(title="Fast", url="https://example.com/fast"),
+        DocLink(title="Slow", url="https://example.com/slow"),
+    ]
+    release = threading.Event()
+
+    monkeypatch.setattr("skillgen.fetcher.markdown_candidates", lambda url: [url])
+
+    def respond(url, **_):
+        if url.endswith("/slow"):
+            release.wait(5)
+        return _response()
+
+    serve(respond)
+
+    try:
+        result = _fetch(links, deadline=0.2)
+    finally:
+        release.set()
+
+    assert list(result.docs) == ["https://example.com/fast"]
+    assert result.warnings == ["fetch deadline reached", "fetch abandoned: https://example.com/slow"]
+
+
+def test_fetch_documents_bounds_inflight_fetches_by_deadline(monkeypatch):
+    monkeypatch.setattr("skillgen.fetcher.markdown_candidates", lambda url: [url])
+    timeouts = []
+
+    class SlowResponse:
+        status_code = 200
+        history: list = []
+        headers = {"Content-Type": "text/markdown"}
+
+        def iter_content(self, chunk_size):
+            while True:
+                time.sleep(0.05)
+                yield b"x"
+
+        def close(self):
+            pass
+
+    class FakeSession:
+        def get(self, url, headers, timeout, stream, allow_redirects):
+            timeouts.append(timeout)
+            return SlowResponse()
+
+    start = time.monotonic()
+    result = _fetch([DocLink(title="Slow", url="https://example.com/slow")], deadline=0.2, session=FakeSession())
+    threading.Event().wait(0.2)
+
+    assert timeouts and timeouts[0] <= 0.2
+    assert result.docs == {}
+    assert not [t for t in threading.enumerate() if t.name.startswith("ThreadPoolExecutor")]
+    assert time.monotonic() - start < 1
+
+
+def test_fetch_text_uses_given_session(monkeypatch, serve):
+    monkeypatch.setattr("skillgen.fetcher._http_cache", DiskCache(ttl=0))
+    sessions = []
+
+    def respond(url, session, **_):
+        sessions.append(session)
+        return _response("# Docs\n", content_type="text/plain")
+
+    serve(respond)
+
+    session = requests.Session()
+    fetch_text("https://example.com/llms.txt", "SkillGen/0.1", session=session)
+    fetch_text("https://example.com/llms.txt", "SkillGen/0.1")
+    fetch_text("https://example.com/llms.txt", "SkillGen/0.1")
+
+    assert sessions[0] is session
+    assert sessions[1] is sessions[2] is not session
+
+
+def test_fetch_documents_fetches_links_concurrently(monkeypatch, serve):
+    links = [DocLink(title=name, url=f"https://example.com/{name}") for name in ("a", "b", "c")]
+    # Each fetch blocks until all three are in flight; a serial loop would time out.
+    barrier = threading.Barrier(3, timeout=5)
+
+    monkeypatch.setattr("skillgen.fetcher.markdown_candidates", lambda url: [url])
+
+    def respond(url, **_):
+        barrier.wait()
+        return _response()
+
+    serve(respond)
+
+    result = _fetch(links)
+
+    assert list(result.docs) == [link.url for link in links]
+    assert all(doc.ok for doc in result.docs.values())
+
+
+def test_fetch_documents_serves_fresh_cache_without_requests(serve):
+    links = [DocLink(title="Guide", url="https://example.com/guide")]
+    fetched = []
+
+    def respond(url, **_):
+        fetched.append(url)
+        if url != "https://example.com/guide.md":
+            return _response(None, status=404, content_type=None, error="http 404")
+        return _response("# Guide\n", etag='"g1"')
+
+    serve(respond)
+
+    first = _fetch(links).docs["https://example.com/guide"]
+    second = _fetch(links).docs["https://example.com/guide"]
+
+    assert fetched == ["https://example.com/guide.md"]
+    assert (second.final_url, second.text, second.bytes, second.etag) == (
+        first.final_url,
+        first.text,
+        first.bytes,
+        first.etag,
+    )
+
+
+def test_fetch_text_honours_cache_control(serve):
+    calls = []
+    headers = {"https://example.com/a.txt": "no-store", "https://example.com/b.txt": "max-age=0"}
+
+    def respond(url, **_):
+        calls.append(url)
+        return _response("# Docs\n", content_type="text/plain", cache_control=headers[url])
+
+    serve(respond)
+
+    for _ in range(2):
+        fetch_text("https://example.com/a.txt", "SkillGen/0.1")
+        fetch_text("https://example.com/b.txt", "SkillGen/0.1")
+
+    cache = DiskCache()
+    assert calls == list(headers) * 2
+    assert cache.get("https://example.com/a.txt") is None
+    assert cache.get("https://example.com/b.txt") is not None
+
+
+def test_disk_cache_prunes_to_byte_and_age_bounds(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=2500)
+    now = time.time()
+    for index in range(4):
+        cache.put(f"https://example.com/{index}", "x" * 1000)
+        os.utime(cache._path(f"https://example.com/{index}"), (now, now - 10 + index))
+    cache.put("https://example.com/old", "x")
+    os.utime(cache._path("https://example.com/old"), (now, now - cache.max_age - 1))
+    assert len(os.listdir(tmp_path)) == 5
+
+    cache.prune()
+
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.basename(cache._path(f"https://example.com/{index}")) for index in (2, 3)
+    )
+
+
+def test_fetch_documents_prunes_cache_once(monkeypatch, serve):
+    cache = DiskCache()
+    prunes = []
+    monkeypatch.setattr(cache, "prune", lambda: prunes.append(1))
+    monkeypatch.setattr("skillgen.fetcher._http_cache", cache)
+    monkeypatch.setattr("skillgen.fetcher.markdown_candidates", lambda url: [url])
+
+    serve(lambda url, **_: _response())
+
+    result = _fetch([DocLink(title=str(i), url=f"https://example.com/{i}") for i in range(8)])
+
+    assert len(result.docs) == 8
+    assert len(os.listdir(cache.directory)) == 8
+    assert prunes == [1]
@@ -1,3 +1,4 @@
+import stat
 from pathlib import Path
 
 import pytest
@@ -46,6 +47,7 @@ def test_install_skill_overwrites_existing_destination(monkeypatch: pytest.Monke
     second = Path(install_skill(str(output_root), "myskill"))
     assert second.exists()
     assert not (second / "old.txt").exists()
+    assert [p.name for p in second.parent.iterdir()] == ["myskill"]
 
 
 def test_install_skill_noop_when_source_equals_destination(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
@@ -58,3 +60,50 @@ def test_install_skill_noop_when_source_equals_destination(monkeypatch: pytest.M
     result = Path(install_skill(str(dest), "myskill"))
     assert result == dest
     assert marker.exists()
+
+
+def test_install_skill_moves_output_when_allowed(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("skillgen.installer.os.path.expanduser", lambda _: str(tmp_path))
+    output_root = _make_output_root(tmp_path / "gen")
+
+    install_path = Path(install_skill(str(output_root), "myskill", allow_move=True))
+    assert install_path == tmp_path / ".agents" / "skills" / "myskill"
+    assert (install_path / "SKILL.md").exists()
+    assert not output_root.exists()
+
+
+def test_install_skill_copies_across_filesystems(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("skillgen.installer.os.path.expanduser", lambda _: str(tmp_path))
+    monkeypatch.setattr("skillgen.installer._same_filesystem", lambda *_: False)
+
+    def no_rename(*_args):
+        raise AssertionError("rename attempted across filesystems")
+
+    monkeypatch.setattr("skillgen.installer.os.rename", no_rename)
+    output_root = _make_output_root(tmp_path / "gen")
+
+    output_root.chmod(0o755)
+
+    install_path = Path(install_skill(str(output_root), "myskill", allow_move=True))
+    assert (install_path / "SKILL.md").exists()
+    assert stat.S_IMODE(install_path.stat().st_mode) == 0o755
+    assert not output_root.exists()
+
+
+def test_install_skill_copies_nested_files(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("skillgen.installer.os.path.expanduser", lambda _: str(tmp_path))
+    output_root = _make_output_root(tmp_path / "gen")
+    pages = output_root / "references" / "sections" / "guides" / "pages"
+    pages.mkdir(parents=True)
+    for i in range(20):
+        (pages / f"page-{i}.md").write_text(f"# Page {i}\n", encoding="utf-8")
+    output_root.chmod(0o755)
+    pages.chmod(0o750)
+
+    install_path = Path(install_skill(str(output_root), "myskill"))
+    copied = install_path / "references" / "sections" / "guides" / "pages"
+    assert sorted(p.name for p in copied.iterdir()) == sorted(p.name for p in pages.iterdir())
+    assert (copied / "page-7.md").read_text(encoding="utf-8") == "# Page 7\n"
+    assert stat.S_IMODE(install_path.stat().st_mode) == stat.S_IMODE(output_root.stat().st_mode)
+    assert stat.S_IMODE(copied.stat().st_mode) == stat.S_IMODE(pages.stat().st_mode)
+    assert output_root.exists()
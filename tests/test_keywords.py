@@ -1,3 +1,6 @@
+import pytest
+
+from skillgen import keywords
 from skillgen.keywords import generate_keywords
 
 
@@ -42,3 +45,13 @@ def test_heuristic_levels_are_distinct():
     assert "Primary coverage includes" in verbose_desc
     assert "Useful navigation anchors include" in verbose_desc
     assert compact_keywords == balanced_keywords == verbose_keywords
+
+
+def test_intent_automaton_matches_substring_scan(monkeypatch):
+    if keywords._INTENT_AUTOMATON is None:
+        pytest.skip("pyahocorasick not installed")
+    corpus = "client setup with oauth tokens, cli usage and pricing plans"
+    with_automaton = keywords._detect_intents(corpus)
+    monkeypatch.setattr(keywords, "_INTENT_AUTOMATON", None)
+    assert keywords._detect_intents(corpus) == with_automaton
+    assert "cli" in with_automaton and "sdk" in with_automaton
@@ -0,0 +1,210 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from skillgen import mcp_server
+
+
+def test_generate_skills_from_urls_reports_each_url(monkeypatch):
+    calls = []
+
+    def fake_resolve(source_url, user_agent):
+        if "broken" in source_url:
+            raise RuntimeError("no llms.txt found")
+        return source_url, f"# {source_url}\n"
+
+    def fake_generate(llms_url, text, **kwargs):
+        calls.append(llms_url)
+        return {"success": True, "source_url": llms_url}
+
+    monkeypatch.setattr(mcp_server, "_resolve_llms", fake_resolve)
+    monkeypatch.setattr(mcp_server, "_generate_from_llms", fake_generate)
+
+    result = mcp_server.generate_skills_from_urls(
+        ["https://a.example", "https://broken.example", "https://a.example"]
+    )
+
+    assert calls == ["https://a.example"]
+    assert [r["source_url"] for r in result["results"]] == ["https://a.example", "https://broken.example"]
+    assert result["success_count"] == 1
+    assert result["failures"] == [
+        {"success": False, "error": "no llms.txt found", "source_url": "https://broken.example"}
+    ]
+
+
+def test_generate_skill_from_url_builds_inside_install_root(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    text = "# Sample Docs\n> Summary.\n\n## Guides\n- [Intro](https://example.com/intro)\n"
+    monkeypatch.setattr(
+        mcp_server, "_resolve_llms", lambda url, ua: ("https://example.com/llms.txt", text)
+    )
+    work_dirs = []
+    real_generate = mcp_server.generate_skill
+
+    def recording_generate(parsed, options, fetch_result):
+        work_dirs.append(options.output_dir)
+        return real_generate(parsed, options, fetch_result)
+
+    monkeypatch.setattr(mcp_server, "generate_skill", recording_generate)
+
+    result = mcp_server.generate_skill_from_url("https://example.com", snapshot=False)
+
+    install_root = tmp_path / ".agents" / "skills"
+    assert result["install_path"] == str(install_root / "sample-docs")
+    assert (install_root / "sample-docs" / "SKILL.md").exists()
+    assert os.path.dirname(work_dirs[0]) == str(install_root)
+    assert os.path.basename(work_dirs[0]).startswith(".skillgen-")
+    assert sorted(p.name for p in install_root.iterdir()) == ["sample-docs"]
+
+
+def test_resolve_llms_remembers_discovered_location(monkeypatch):
+    mcp_server._llms_locations.clear()
+    probes = []
+    fetches = []
+
+    def fake_discover_and_fetch(base_url, user_agent):
+        probes.append(base_url)
+        return base_url + "/.well-known/llms.txt", "# Docs\n"
+
+    def fake_fetch_text(url, user_agent):
+        fetches.append(url)
+        return "# Docs\n"
+
+    monkeypatch.setattr(mcp_server, "discover_and_fetch", fake_discover_and_fetch)
+    monkeypatch.setattr(mcp_server, "fetch_text", fake_fetch_text)
+
+    for _ in range(3):
+        assert mcp_server._resolve_llms("https://example.com", "SkillGen/0.1") == (
+            "https://example.com/.well-known/llms.txt",
+            "# Docs\n",
+        )
+    # The cold call downloads llms.txt once, while probing; later calls go
+    # straight to the remembered location.
+    assert probes == ["https://example.com"]
+    assert fetches == ["https://example.com/.well-known/llms.txt"] * 2
+    mcp_server._llms_locations.clear()
+
+
+def test_server_is_built_once_with_every_tool():
+    server = mcp_server.mcp
+    assert mcp_server.mcp is server
+    tools = asyncio.run(server.list_tools())
+    assert {tool.name for tool in tools} == {fn.__name__ for fn in mcp_server._TOOLS}
+
+
+def test_parse_llms_reuses_parse_of_identical_text(monkeypatch):
+    mcp_server._parse_cached.cache_clear()
+    calls = []
+    real_parse = mcp_server.parse_llms_text
+
+    def counting_parse(text, source_url=None):
+        calls.append(source_url)
+        return real_parse(text, source_url=source_url)
+
+    monkeypatch.setattr(mcp_server, "parse_llms_text", counting_parse)
+    text = "# Docs\n\n## API\n- [Ref](https://example.com/ref)\n"
+
+    first = mcp_server.parse_llms(text, is_url=False)
+    second = mcp_server.parse_llms(text, is_url=False)
+
+    assert first == second
+    assert first["total_links"] == 1
+    assert calls == [None]
+    mcp_server._parse_cached.cache_clear()
+
+
+def test_generate_skills_from_urls_reports_shared_title_collisions(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    text = "# Docs\n> Summary.\n\n## Guides\n- [Intro](https://example.com/intro)\n"
+    monkeypatch.setattr(mcp_server, "_resolve_llms", lambda url, ua: (url + "/llms.txt", text))
+
+    urls = [f"https://site{i}.example" for i in range(8)]
+    result = mcp_server.generate_skills_from_urls(urls, snapshot=False)
+
+    assert result["success_count"] == 1
+    assert result["results"][0]["success"] is True
+    assert result["results"][0]["source_url"] == "https://site0.example/llms.txt"
+    assert [f["source_url"] for f in result["failures"]] == urls[1:]
+    assert all("https://site0.example" in f["error"] for f in result["failures"])
+    install_root = tmp_path / ".agents" / "skills"
+    assert sorted(p.name for p in install_root.iterdir()) == ["docs"]
+    assert (install_root / "docs" / "SKILL.md").exists()
+    assert (install_root / "docs" / "references" / "catalog.json").exists()
+
+
+def _count_generations(monkeypatch):
+    calls = []
+    real_generate = mcp_server.generate_skill
+
+    def counting_generate(parsed, options, fetch_result):
+        calls.append(parsed.title)
+        return real_generate(parsed, options, fetch_result)
+
+    monkeypatch.setattr(mcp_server, "generate_skill", counting_generate)
+    return calls
+
+
+def _skill_slots():
+    skills_cache = os.path.join(mcp_server.cache_dir(), "skills")
+    return sorted(os.listdir(skills_cache)) if os.path.isdir(skills_cache) else []
+
+
+def test_generate_skill_from_text_reuses_cached_skill(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    calls = _count_generations(monkeypatch)
+    text = "# Cached Docs\n\n## API\n- [Ref](https://example.com/ref)\n"
+
+    first = mcp_server.generate_skill_from_text(text)
+    second = mcp_server.generate_skill_from_text(text)
+    assert calls == ["Cached Docs"]
+    assert first["output_path"] == second["output_path"]
+    assert os.path.exists(os.path.join(second["install_path"], "SKILL.md"))
+
+    mcp_server.generate_skill_from_text(text, heuristic_level="verbose")
+    assert len(calls) == 2
+
+
+def test_generate_skill_from_text_regenerates_stale_or_other_version(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    calls = _count_generations(monkeypatch)
+    text = "# Cached Docs\n\n## API\n- [Ref](https://example.com/ref)\n"
+
+    first = mcp_server.generate_skill_from_text(text)
+    slot = os.path.dirname(first["output_path"])
+    old = time.time() - mcp_server._SKILL_CACHE_TTL - 60
+    os.utime(slot, (old, old))
+    mcp_server.generate_skill_from_text(text)
+    assert len(calls) == 2
+
+    monkeypatch.setattr(mcp_server, "_skillgen_version", lambda: "0.0.0-test")
+    upgraded = mcp_server.generate_skill_from_text(text)
+    assert len(calls) == 3
+    assert os.path.dirname(upgraded["output_path"]) != slot
+
+
+def test_generate_skill_cache_keeps_newest_slots(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(mcp_server, "_SKILL_CACHE_MAX", 2)
+
+    paths = [
+        mcp_server.generate_skill_from_text(f"# Docs {i}\n\n## API\n- [Ref](https://example.com/{i})\n")["output_path"]
+        for i in range(3)
+    ]
+
+    assert _skill_slots() == sorted(os.path.basename(os.path.dirname(p)) for p in paths[1:])
+
+
+def test_generate_skill_cache_removes_staging_on_failure(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    def failing_generate(parsed, options, fetch_result):
+        os.makedirs(os.path.join(options.output_dir, "half-written"))
+        raise ValueError("render failed")
+
+    monkeypatch.setattr(mcp_server, "generate_skill", failing_generate)
+
+    with pytest.raises(ValueError):
+        mcp_server.generate_skill_from_text("# Docs\n")
+    assert _skill_slots() == []
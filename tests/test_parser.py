@@ -1,3 +1,7 @@
+import dataclasses
+
+import pytest
+
 from skillgen.parser import parse_llms_text
 
 
@@ -19,3 +23,25 @@ def test_parse_llms_text():
     assert parsed.sections[0].title == "Guides"
     assert parsed.sections[1].optional is True
     assert parsed.sections[0].links[0].url == "https://example.com/intro"
+    assert parsed.sections[1].links[0].section_title == "Optional"
+    assert len({link for s in parsed.sections for link in s.links}) == 2
+    assert parsed.section_titles == ("Guides", "Optional")
+    assert [link.title for link in parsed.links] == ["Intro", "Extra"]
+    assert parsed.link_count == 2
+
+
+
+def test_parse_llms_text_collects_summary_across_blank_lines():
+    text = "# Docs\n> Short.\n\n> More.\nIntro text.\n## API\n- [Ref](https://example.com/ref): Reference\n"
+    parsed = parse_llms_text(text)
+    assert parsed.summary == "Short.\nMore."
+    assert parsed.preamble == "Intro text."
+    assert parsed.raw_text == text
+
+
+def test_parsed_llms_is_immutable():
+    parsed = parse_llms_text("# Docs\n\n## API\n- [Ref](https://example.com/ref)\n")
+    assert isinstance(parsed.sections, tuple)
+    assert parsed.link_count == 1
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        parsed.title = "Other"